@@ -5,14 +5,20 @@ A tool that simplifies complex legal documents into clear, accessible guidance.
 """
 
 import streamlit as st
-import PyPDF2
-import docx
 import re
+import io
 import json
+import bisect
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-import textwrap
-import base64
+from typing import Dict, List, Any, Optional, Iterator, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pypdf
+
+try:
+    import ahocorasick  # optional: linear-time multi-keyword matching
+except ImportError:
+    ahocorasick = None
 
 # Set page configuration
 st.set_page_config(
@@ -122,6 +128,16 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Number of characters decoded per read when extracting plain-text uploads
+TXT_READ_CHUNK_SIZE = 1 << 20
+
+# Number of sections shown as tabs in the simplified explanation
+MAX_TABS = 6
+
+# Bounds on cached analysis results, which are shared across sessions
+ANALYSIS_CACHE_MAX_ENTRIES = 8
+ANALYSIS_CACHE_TTL = 60 * 60  # seconds
+
 class LegalDocumentSimplifier:
     """Main class for simplifying legal documents"""
     
@@ -159,22 +175,132 @@ class LegalDocumentSimplifier:
             "force majeure": "This section excuses parties from fulfilling obligations due to extraordinary events beyond their control.",
             "representations and warranties": "This section contains promises about facts and conditions related to the agreement."
         }
+        
+        # Document types in priority order with the keywords that identify them
+        self.document_types = [
+            ("Rental Agreement", ["lease", "rental", "tenant", "landlord"]),
+            ("Loan Agreement", ["loan", "borrower", "lender", "interest rate", "repayment"]),
+            ("Terms of Service", ["terms of service", "terms and conditions", "user agreement"]),
+            ("Employment Contract", ["employment", "employee", "employer", "non-compete"]),
+            ("Non-Disclosure Agreement", ["nda", "non-disclosure", "confidentiality"]),
+            ("Purchase Agreement", ["purchase", "sale", "buyer", "seller"]),
+        ]
+        
+        # Common legal section headings
+        self.section_headings = [
+            "parties", "recitals", "terms", "definitions", "obligations",
+            "payment", "confidentiality", "term and termination", "warranties",
+            "limitation of liability", "indemnification", "governing law",
+            "dispute resolution", "miscellaneous", "notices", "signatures"
+        ]
+        
+        # Common legal patterns and their plain-language replacements
+        self.legal_patterns = [
+            (r'notwithstanding anything to the contrary contained herein', 'despite anything else in this document'),
+            (r'in the event that', 'if'),
+            (r'for the purpose of', 'to'),
+            (r'prior to', 'before'),
+            (r'subsequent to', 'after'),
+            (r'pursuant to', 'under'),
+            (r'without limiting the generality of the foregoing', 'including but not limited to'),
+            (r'set forth herein', 'described in this document'),
+            (r'shall be deemed to be', 'will be considered'),
+            (r'is hereby granted', 'is given'),
+        ]
+        
+        # Risk patterns to look for, each with literal keywords of which at least
+        # one must appear in the lowercased text for the pattern to possibly match
+        self.risk_patterns = [
+            (("indemnify", "hold harmless"), r'indemnify|hold harmless', "You might be responsible for paying for damages or losses", "high"),
+            (("liability",), r'liability.*limit|limit.*liability', "There may be limits on how much you can claim if something goes wrong", "medium"),
+            (("confidentiality", "non-disclosure"), r'confidentiality|non-disclosure', "You may be required to keep information secret", "medium"),
+            (("termination",), r'termination.*without cause|termination.*at will', "The agreement might be ended without a specific reason", "medium"),
+            (("arbitration",), r'arbitration.*dispute|dispute.*arbitration', "You might not be able to sue in court and must use arbitration instead", "medium"),
+            (("governing law",), r'governing law.*jurisdiction', "Disputes might be handled in a location that's not convenient for you", "low"),
+            (("automatic renewal", "evergreen"), r'automatic renewal|evergreen', "The agreement might renew automatically unless you cancel it", "medium"),
+            (("non-compete", "non-solicit"), r'non-compete|non-solicit', "You might be restricted from working with competitors or clients", "high"),
+            (("liquidated damages",), r'liquidated damages', "You might have to pay a predetermined amount if you breach the agreement", "high"),
+            (("assignment",), r'assignment.*without consent', "The other party might transfer the agreement without your permission", "medium"),
+        ]
+        
+        # Pre-compile regex patterns once so they are reused across documents and sections
+        # Legal terms and phrases are each matched with a single alternation so the
+        # text is rewritten in one scan. Every alternative is its own group, so the
+        # match's lastindex maps straight back to the term or phrase it came from.
+        self._terms = sorted(self.legal_terms, key=len, reverse=True)
+        self._terms_re = re.compile(
+            r'\b(?:' + '|'.join(f'({re.escape(term)})' for term in self._terms) + r')\b',
+            re.IGNORECASE
+        )
+        self._phrases = sorted(self.legal_patterns, key=lambda item: len(item[0]), reverse=True)
+        self._phrases_re = re.compile(
+            '|'.join(f'({pattern})' for pattern, _ in self._phrases),
+            re.IGNORECASE
+        )
+        self._heading_re = re.compile('|'.join(re.escape(heading) for heading in self.section_headings), re.IGNORECASE)
+        
+        # An Aho-Corasick automaton finds any heading in a line in a single pass when
+        # pyahocorasick is installed; otherwise the compiled heading regex is used
+        self._heading_automaton = None
+        if ahocorasick is not None:
+            self._heading_automaton = ahocorasick.Automaton()
+            for heading in self.section_headings:
+                self._heading_automaton.add_word(heading, heading)
+            self._heading_automaton.make_automaton()
+        
+        self._risk_patterns = [
+            (keywords, re.compile(pattern, re.IGNORECASE), description, risk_level)
+            for keywords, pattern, description, risk_level in self.risk_patterns
+        ]
+        self._sentence_split = re.compile(r'(?<=[.!?]) +')
+        self._clause_split = re.compile(r', |; |: ')
+        self._word_re = re.compile(r'\S+')
     
     def extract_text_from_pdf(self, file) -> str:
         """Extract text from PDF files"""
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
+        # Parsers are imported on first use so sessions that never upload that
+        # format don't pay for loading them at startup
+        import pypdf
+        
+        pdf_reader = pypdf.PdfReader(file, strict=False)
+        
+        parts = []
+        for page_text in self._iter_pdf_pages(pdf_reader):
+            parts.append(page_text)
+            parts.append("\n")
+        return "".join(parts)
+    
+    def _iter_pdf_pages(self, pdf_reader: "pypdf.PdfReader") -> Iterator[str]:
+        """Yield the text of each PDF page"""
         for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+            yield page.extract_text() or ""
     
     def extract_text_from_docx(self, file) -> str:
         """Extract text from DOCX files"""
+        import docx
+        
         doc = docx.Document(file)
-        text = ""
+        parts = []
         for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+            parts.append(paragraph.text)
+            parts.append("\n")
+        return "".join(parts)
+    
+    def extract_text_from_txt(self, file) -> str:
+        """Extract text from TXT files, decoding in chunks"""
+        # utf-8-sig strips a leading BOM; undecodable bytes become U+FFFD instead of failing
+        reader = io.TextIOWrapper(file, encoding="utf-8-sig", errors="replace", newline="")
+        try:
+            parts = []
+            while True:
+                chunk = reader.read(TXT_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                parts.append(chunk)
+            return "".join(parts)
+        finally:
+            # Hand the underlying file back without closing it
+            reader.detach()
     
     def extract_text_from_file(self, file) -> str:
         """Extract text from uploaded file based on file type"""
@@ -185,58 +311,48 @@ class LegalDocumentSimplifier:
         elif file_type == 'docx':
             return self.extract_text_from_docx(file)
         elif file_type == 'txt':
-            return str(file.read(), "utf-8")
+            return self.extract_text_from_txt(file)
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
     
-    def identify_document_type(self, text: str) -> str:
+    def identify_document_type(self, text: str, text_lower: Optional[str] = None) -> str:
         """Identify the type of legal document"""
-        text_lower = text.lower()
-        
-        if any(term in text_lower for term in ["lease", "rental", "tenant", "landlord"]):
-            return "Rental Agreement"
-        elif any(term in text_lower for term in ["loan", "borrower", "lender", "interest rate", "repayment"]):
-            return "Loan Agreement"
-        elif any(term in text_lower for term in ["terms of service", "terms and conditions", "user agreement"]):
-            return "Terms of Service"
-        elif any(term in text_lower for term in ["employment", "employee", "employer", "non-compete"]):
-            return "Employment Contract"
-        elif any(term in text_lower for term in ["nda", "non-disclosure", "confidentiality"]):
-            return "Non-Disclosure Agreement"
-        elif any(term in text_lower for term in ["purchase", "sale", "buyer", "seller"]):
-            return "Purchase Agreement"
-        else:
-            return "Legal Document"
+        # Plain substring scans over one lowercase copy are far cheaper than a
+        # case-insensitive regex alternation over the same keywords
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        for doc_type, keywords in self.document_types:
+            if any(keyword in text_lower for keyword in keywords):
+                return doc_type
+        
+        return "Legal Document"
+    
+    def _contains_heading(self, line: str) -> bool:
+        """Check whether a line mentions one of the known section headings"""
+        if self._heading_automaton is not None:
+            return next(self._heading_automaton.iter(line.lower()), None) is not None
+        return bool(self._heading_re.search(line))
     
     def identify_key_sections(self, text: str) -> Dict[str, str]:
         """Identify key sections in the legal document"""
         sections = {}
+        
+        # Scanning line by line lets the cheap word-count check reject body text
+        # before any regex runs; a heading finditer over the full text would have
+        # to examine every character of every line and is far slower
         lines = text.split('\n')
         current_section = "Introduction"
         section_content = []
         
-        # Common legal section headings
-        section_headings = [
-            "parties", "recitals", "terms", "definitions", "obligations",
-            "payment", "confidentiality", "term and termination", "warranties",
-            "limitation of liability", "indemnification", "governing law",
-            "dispute resolution", "miscellaneous", "notices", "signatures"
-        ]
-        
         for line in lines:
             line_stripped = line.strip()
             if not line_stripped:
                 continue
-                
-            # Create lowercase version for comparison
-            line_lower = line_stripped.lower()
-                
-            # Check if line is a section heading
-            is_heading = False
-            for heading in section_headings:
-                if heading in line_lower and len(line_stripped.split()) < 8:
-                    is_heading = True
-                    break
+            
+            # A heading is a short line (fewer than 8 words) mentioning a known section name;
+            # the cheap word-count check runs first and stops splitting after 8 words
+            is_heading = len(line_stripped.split(None, 7)) < 8 and self._contains_heading(line_stripped)
             
             if is_heading:
                 if section_content and current_section:
@@ -251,103 +367,132 @@ class LegalDocumentSimplifier:
             
         return sections
     
-    def simplify_legal_text(self, text: str) -> str:
-        """Simplify legal text using rule-based approach and patterns"""
-        if not text.strip():
-            return ""
-            
+    def _replace_term(self, match: re.Match) -> str:
+        """Wrap a matched legal term and append its plain-language explanation"""
+        term = self._terms[match.lastindex - 1]
+        return f'<span class="legal-term">{term}</span> ({self.legal_terms[term]})'
+    
+    def _replace_phrase(self, match: re.Match) -> str:
+        """Return the plain-language replacement for a matched legal phrase"""
+        return self._phrases[match.lastindex - 1][1]
+    
+    def _simplify_sentence(self, sentence: str) -> List[str]:
+        """Simplify a single sentence, breaking it into clauses if it is long"""
         # Replace legal terms with simpler explanations
-        simplified_text = text
-        for term, explanation in self.legal_terms.items():
-            simplified_text = re.sub(
-                rf'\b{term}\b', 
-                f'<span class="legal-term">{term}</span> ({explanation})', 
-                simplified_text, 
-                flags=re.IGNORECASE
-            )
+        sentence = self._terms_re.sub(self._replace_term, sentence)
         
         # Identify and simplify common legal patterns
-        patterns = [
-            (r'notwithstanding anything to the contrary contained herein', 'despite anything else in this document'),
-            (r'in the event that', 'if'),
-            (r'for the purpose of', 'to'),
-            (r'prior to', 'before'),
-            (r'subsequent to', 'after'),
-            (r'pursuant to', 'under'),
-            (r'without limiting the generality of the foregoing', 'including but not limited to'),
-            (r'set forth herein', 'described in this document'),
-            (r'shall be deemed to be', 'will be considered'),
-            (r'is hereby granted', 'is given'),
-        ]
-        
-        for pattern, replacement in patterns:
-            simplified_text = re.sub(pattern, replacement, simplified_text, flags=re.IGNORECASE)
+        sentence = self._phrases_re.sub(self._replace_phrase, sentence)
         
         # Break down long sentences
-        sentences = re.split(r'(?<=[.!?]) +', simplified_text)
-        simplified_sentences = []
+        if len(sentence.split(None, 25)) > 25:  # Long sentence (stop counting past 25 words)
+            # Simple approach to break down long sentences
+            clauses = self._clause_split.split(sentence)
+            if len(clauses) > 1:
+                return clauses
+        return [sentence]
+    
+    def simplify_legal_text(self, text: str, sentences: Optional[List[str]] = None) -> str:
+        """Simplify legal text using rule-based approach and patterns"""
+        if not text.strip():
+            return ""
+        
+        # Replacements never add or remove sentence boundaries, so the text can
+        # be split first (or reuse an existing split) and each sentence simplified
+        if sentences is None:
+            sentences = self._sentence_split.split(text)
         
+        simplified_sentences = []
         for sentence in sentences:
-            if len(sentence.split()) > 25:  # Long sentence
-                # Simple approach to break down long sentences
-                clauses = re.split(r', |; |: ', sentence)
-                if len(clauses) > 1:
-                    simplified_sentences.extend(clauses)
-                else:
-                    simplified_sentences.append(sentence)
-            else:
-                simplified_sentences.append(sentence)
+            simplified_sentences.extend(self._simplify_sentence(sentence))
         
         return ". ".join(simplified_sentences)
     
-    def identify_risks(self, text: str) -> List[Dict[str, Any]]:
+    def split_sentences(self, text: str) -> Tuple[List[str], List[int]]:
+        """Split text into sentences, also returning the offset where each one starts"""
+        sentences = []
+        sentence_starts = []
+        start = 0
+        for separator in self._sentence_split.finditer(text):
+            sentences.append(text[start:separator.start()])
+            sentence_starts.append(start)
+            start = separator.end()
+        sentences.append(text[start:])
+        sentence_starts.append(start)
+        return sentences, sentence_starts
+    
+    def identify_risks(self, text: str, sentences: Optional[List[str]] = None,
+                       sentence_starts: Optional[List[int]] = None,
+                       text_lower: Optional[str] = None) -> List[Dict[str, Any]]:
         """Identify potential risks in the legal document"""
         risks = []
-        text_lower = text.lower()
-        
-        # Risk patterns to look for
-        risk_patterns = [
-            (r'indemnify|hold harmless', "You might be responsible for paying for damages or losses", "high"),
-            (r'liability.*limit|limit.*liability', "There may be limits on how much you can claim if something goes wrong", "medium"),
-            (r'confidentiality|non-disclosure', "You may be required to keep information secret", "medium"),
-            (r'termination.*without cause|termination.*at will', "The agreement might be ended without a specific reason", "medium"),
-            (r'arbitration.*dispute|dispute.*arbitration', "You might not be able to sue in court and must use arbitration instead", "medium"),
-            (r'governing law.*jurisdiction', "Disputes might be handled in a location that's not convenient for you", "low"),
-            (r'automatic renewal|evergreen', "The agreement might renew automatically unless you cancel it", "medium"),
-            (r'non-compete|non-solicit', "You might be restricted from working with competitors or clients", "high"),
-            (r'liquidated damages', "You might have to pay a predetermined amount if you breach the agreement", "high"),
-            (r'assignment.*without consent', "The other party might transfer the agreement without your permission", "medium"),
-        ]
         
-        for pattern, description, risk_level in risk_patterns:
-            if re.search(pattern, text_lower):
+        # Split into sentences once and share them across all risk patterns
+        if sentences is None or sentence_starts is None:
+            sentences, sentence_starts = self.split_sentences(text)
+        
+        # Cheap substring checks rule out most patterns before any regex search runs
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        for keywords, pattern, description, risk_level in self._risk_patterns:
+            if not any(keyword in text_lower for keyword in keywords):
+                continue
+            
+            match = pattern.search(text)
+            if match:
                 risks.append({
                     "description": description,
                     "level": risk_level,
-                    "examples": self.find_example_clauses(text, pattern)
+                    "examples": self.find_example_clauses(text, match, sentences, sentence_starts)
                 })
         
         return risks
     
-    def find_example_clauses(self, text: str, pattern: str) -> List[str]:
-        """Find example clauses that match a pattern"""
+    def find_example_clauses(self, text: str, match: re.Match, sentences: List[str],
+                             sentence_starts: List[int]) -> List[str]:
+        """Find example clauses for a pattern, starting from its first match in the text"""
         examples = []
-        sentences = re.split(r'(?<=[.!?]) +', text)
+        pattern = match.re
         
-        for sentence in sentences:
-            if re.search(pattern, sentence, re.IGNORECASE):
-                examples.append(sentence.strip())
-                if len(examples) >= 3:  # Limit to 3 examples
-                    break
+        while match and len(examples) < 3:  # Limit to 3 examples
+            # Locate the sentence containing the match; it is only an example if the
+            # pattern also matches within that sentence alone
+            index = bisect.bisect_right(sentence_starts, match.start()) - 1
+            if pattern.search(sentences[index]):
+                examples.append(sentences[index].strip())
+            
+            # Resume scanning the full text at the next sentence
+            if index + 1 >= len(sentences):
+                break
+            match = pattern.search(text, sentence_starts[index + 1])
         
         return examples
     
+    def _shorten_preview(self, text: str, width: int = 150, placeholder: str = "...") -> str:
+        """Collapse whitespace and trim text to width at a word boundary, reading only its start"""
+        # Gather words only until the collapsed text overflows width, so the work is
+        # bounded no matter how long the text or how much whitespace it contains
+        words = []
+        length = -1
+        for match in self._word_re.finditer(text):
+            words.append(match.group())
+            length += len(words[-1]) + 1
+            if length > width:
+                break
+        else:
+            return " ".join(words)
+        
+        preview = " ".join(words)
+        cut = preview.rfind(" ", 0, width - len(placeholder) + 1)
+        return (preview[:cut] if cut > 0 else "") + placeholder
+    
     def generate_summary(self, document_type: str, sections: Dict[str, str]) -> str:
         """Generate a summary of the document"""
         summary = f"This is a {document_type} that includes the following key sections:\n\n"
         
         for section_name, section_content in sections.items():
-            summary += f"• {section_name}: {textwrap.shorten(section_content, width=150, placeholder='...')}\n"
+            summary += f"• {section_name}: {self._shorten_preview(section_content)}\n"
         
         summary += "\nKey things to pay attention to:\n"
         
@@ -380,27 +525,39 @@ class LegalDocumentSimplifier:
             # Extract text from the file
             text = self.extract_text_from_file(file)
             
+            # Lowercase the document once for every keyword check that needs it
+            text_lower = text.lower()
+            
             # Identify document type
-            doc_type = self.identify_document_type(text)
+            doc_type = self.identify_document_type(text, text_lower)
             
             # Identify key sections
             sections = self.identify_key_sections(text)
             
+            # Split into sentences once for both simplification and risk detection
+            sentences, sentence_starts = self.split_sentences(text)
+            
             # Simplify the entire document
-            simplified_text = self.simplify_legal_text(text)
+            simplified_text = self.simplify_legal_text(text, sentences)
             
             # Identify risks
-            risks = self.identify_risks(text)
+            risks = self.identify_risks(text, sentences, sentence_starts, text_lower)
+            
+            # Simplify only the sections that are shown as tabs
+            simplified_sections = {
+                name: self.simplify_legal_text(content) for name, content in list(sections.items())[:MAX_TABS]
+            }
             
             # Generate summary
             summary = self.generate_summary(doc_type, sections)
             
             return {
                 "success": True,
-                "original_text": text,
                 "simplified_text": simplified_text,
                 "document_type": doc_type,
-                "sections": sections,
+                # Full section bodies are only needed above; keep just what the UI shows
+                "section_previews": {name: content[:500] for name, content in sections.items()},
+                "simplified_sections": simplified_sections,
                 "risks": risks,
                 "summary": summary,
                 "file_name": file.name
@@ -412,11 +569,58 @@ class LegalDocumentSimplifier:
                 "error": str(e)
             }
 
-def create_download_link(content, filename, text):
-    """Generate a download link for the content"""
-    b64 = base64.b64encode(content.encode()).decode()
-    href = f'<a href="data:file/txt;base64,{b64}" download="{filename}" class="icon-button">📥 {text}</a>'
-    return href
+def _build_report_sections(result: Dict[str, Any]) -> Dict[str, str]:
+    """Build the full, summary-only and risks-only reports from one pass over the results"""
+    risk_lines = "".join(
+        f"- {risk['description']} (Risk level: {risk['level'].upper()})\n" for risk in result["risks"]
+    )
+    
+    full_report = (
+        "Legal Document Analysis Report\n"
+        f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+        f"Document: {result['file_name']}\n"
+        f"Type: {result['document_type']}\n\n"
+        "SUMMARY:\n"
+        f"{result['summary']}\n\n"
+        "RISKS IDENTIFIED:\n"
+        f"{risk_lines}\n"
+        "SIMPLIFIED EXPLANATION:\n"
+        f"{result['simplified_text']}"
+    )
+    
+    return {
+        "full": full_report,
+        "summary": f"Document Summary - {result['file_name']}\n\n{result['summary']}",
+        "risks": f"Risk Assessment - {result['file_name']}\n\n{risk_lines}",
+    }
+
+def _render_risk_cards(risks: List[Dict[str, Any]]) -> str:
+    """Render risk cards as a single HTML string so they can be sent in one element"""
+    cards = []
+    for risk in risks:
+        cards.append(f'<div class="section-card risk-{risk["level"]}">')
+        cards.append(f'<span class="tag tag-{risk["level"]}">{risk["level"].upper()}</span>')
+        cards.append(f'<p><strong>{risk["description"]}</strong></p>')
+        
+        if risk["examples"]:
+            cards.append('<details><summary>View relevant clauses</summary>')
+            for example in risk["examples"]:
+                cards.append(f'<div style="font-size: 0.9em; color: #64748B; margin: 0.5rem 0;">{example}</div>')
+            cards.append('</details>')
+        cards.append('</div>')
+    return "".join(cards)
+
+@st.cache_resource(show_spinner=False)
+def get_simplifier() -> LegalDocumentSimplifier:
+    """Create the simplifier once so its compiled patterns are shared across reruns"""
+    return LegalDocumentSimplifier()
+
+@st.cache_data(show_spinner=False, max_entries=ANALYSIS_CACHE_MAX_ENTRIES, ttl=ANALYSIS_CACHE_TTL)
+def _analyze(file_bytes: bytes, filename: str) -> Dict[str, Any]:
+    """Analyze an uploaded document, cached by its contents and file name"""
+    file = io.BytesIO(file_bytes)
+    file.name = filename
+    return get_simplifier().process_document(file)
 
 def main():
     """Main application function"""
@@ -428,9 +632,6 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
-    # Initialize the simplifier
-    simplifier = LegalDocumentSimplifier()
-    
     # File upload section
     uploaded_file = st.file_uploader(
         "Choose a legal document (PDF, DOCX, or TXT)",
@@ -440,7 +641,7 @@ def main():
     
     if uploaded_file is not None:
         with st.spinner("Analyzing your document..."):
-            result = simplifier.process_document(uploaded_file)
+            result = _analyze(uploaded_file.getvalue(), uploaded_file.name)
         
         if result["success"]:
             # Display document information in a compact way
@@ -448,7 +649,7 @@ def main():
             with col1:
                 st.metric("Document Type", result["document_type"])
             with col2:
-                st.metric("Sections", len(result["sections"]))
+                st.metric("Sections", len(result["section_previews"]))
             with col3:
                 st.metric("Risks", len(result["risks"]))
             with col4:
@@ -458,16 +659,13 @@ def main():
             
             # Document Summary in a compact card
             st.markdown('<div class="sub-header">📋 Document Summary</div>', unsafe_allow_html=True)
-            with st.container():
-                st.markdown('<div class="compact-section">', unsafe_allow_html=True)
-                
-                # Summary items as compact cards
-                summary_items = result["summary"].split('\n')
-                for item in summary_items:
-                    if item.strip() and not item.strip().startswith('This is a'):
-                        st.markdown(f'<div class="summary-item">{item.strip()}</div>', unsafe_allow_html=True)
-                
-                st.markdown('</div>', unsafe_allow_html=True)
+            # Summary items as compact cards, rendered in a single element
+            summary_html = ['<div class="compact-section">']
+            for item in result["summary"].split('\n'):
+                if item.strip() and not item.strip().startswith('This is a'):
+                    summary_html.append(f'<div class="summary-item">{item.strip()}</div>')
+            summary_html.append('</div>')
+            st.markdown("".join(summary_html), unsafe_allow_html=True)
             
             # Display risks in a compact way
             if result["risks"]:
@@ -476,59 +674,38 @@ def main():
                 risk_col1, risk_col2 = st.columns(2)
                 
                 with risk_col1:
-                    for risk in result["risks"]:
-                        if risk["level"] in ["high", "medium"]:
-                            risk_class = f"risk-{risk['level']}"
-                            tag_class = f"tag tag-{risk['level']}"
-                            
-                            st.markdown(f'<div class="section-card {risk_class}">', unsafe_allow_html=True)
-                            st.markdown(f'<span class="{tag_class}">{risk["level"].upper()}</span>', unsafe_allow_html=True)
-                            st.markdown(f"**{risk['description']}**")
-                            
-                            if risk["examples"]:
-                                with st.expander("View relevant clauses"):
-                                    for example in risk["examples"]:
-                                        st.markdown(f'<div style="font-size: 0.9em; color: #64748B; margin: 0.5rem 0;">{example}</div>', unsafe_allow_html=True)
-                            st.markdown('</div>', unsafe_allow_html=True)
+                    st.markdown(_render_risk_cards([risk for risk in result["risks"] if risk["level"] in ["high", "medium"]]), unsafe_allow_html=True)
                 
                 with risk_col2:
-                    for risk in result["risks"]:
-                        if risk["level"] == "low":
-                            risk_class = f"risk-{risk['level']}"
-                            tag_class = f"tag tag-{risk['level']}"
-                            
-                            st.markdown(f'<div class="section-card {risk_class}">', unsafe_allow_html=True)
-                            st.markdown(f'<span class="{tag_class}">{risk["level"].upper()}</span>', unsafe_allow_html=True)
-                            st.markdown(f"**{risk['description']}**")
-                            
-                            if risk["examples"]:
-                                with st.expander("View relevant clauses"):
-                                    for example in risk["examples"]:
-                                        st.markdown(f'<div style="font-size: 0.9em; color: #64748B; margin: 0.5rem 0;">{example}</div>', unsafe_allow_html=True)
-                            st.markdown('</div>', unsafe_allow_html=True)
+                    st.markdown(_render_risk_cards([risk for risk in result["risks"] if risk["level"] == "low"]), unsafe_allow_html=True)
             
             # Simplified explanation in an accordion style
             st.markdown('<div class="sub-header">📝 Simplified Explanation</div>', unsafe_allow_html=True)
             
             # Show section by section if we have sections
-            if result["sections"]:
+            if result["section_previews"]:
                 # Create tabs for each section
-                tab_list = list(result["sections"].keys())[:6]  # Limit to first 6 sections for compactness
+                tab_list = list(result["section_previews"].keys())[:MAX_TABS]  # Limit to the first few sections for compactness
                 tabs = st.tabs(tab_list)
                 
-                for i, (section_name, section_content) in enumerate(result["sections"].items()):
-                    if i < len(tabs):  # Only show first 6 sections in tabs
+                for i, (section_name, section_preview) in enumerate(result["section_previews"].items()):
+                    if i < len(tabs):  # Only show the first MAX_TABS sections in tabs
                         with tabs[i]:
-                            st.markdown("**Original Text:**")
-                            st.markdown(f'<div style="font-size: 0.9em; background-color: #F8FAFC; padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0;">{section_content[:500]}...</div>', unsafe_allow_html=True)
-                            
-                            st.markdown("**Simplified Explanation:**")
-                            simplified_section = simplifier.simplify_legal_text(section_content)
-                            st.markdown(f'<div style="font-size: 0.95em; background-color: #F0FDF4; padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0;">{simplified_section[:600]}...</div>', unsafe_allow_html=True)
+                            simplified_section = result["simplified_sections"][section_name]
+                            st.markdown(
+                                '<p><strong>Original Text:</strong></p>'
+                                f'<div style="font-size: 0.9em; background-color: #F8FAFC; padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0;">{section_preview}...</div>'
+                                '<p><strong>Simplified Explanation:</strong></p>'
+                                f'<div style="font-size: 0.95em; background-color: #F0FDF4; padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0;">{simplified_section[:600]}...</div>',
+                                unsafe_allow_html=True
+                            )
                             
                             if st.button("View Full Section", key=f"btn_{i}"):
-                                st.markdown("**Full Simplified Explanation:**")
-                                st.markdown(f'<div style="font-size: 0.95em; background-color: #F0FDF4; padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0;">{simplified_section}</div>', unsafe_allow_html=True)
+                                st.markdown(
+                                    '<p><strong>Full Simplified Explanation:</strong></p>'
+                                    f'<div style="font-size: 0.95em; background-color: #F0FDF4; padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0;">{simplified_section}</div>',
+                                    unsafe_allow_html=True
+                                )
             else:
                 # Fallback if sections weren't properly identified
                 st.markdown("**Simplified Explanation:**")
@@ -538,21 +715,8 @@ def main():
             st.markdown("---")
             st.markdown('<div class="sub-header">💾 Download Results</div>', unsafe_allow_html=True)
             
-            # Create a simplified report
-            report = f"Legal Document Analysis Report\n"
-            report += f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-            report += f"Document: {result['file_name']}\n"
-            report += f"Type: {result['document_type']}\n\n"
-            report += "SUMMARY:\n"
-            report += result["summary"] + "\n\n"
-            
-            report += "RISKS IDENTIFIED:\n"
-            for risk in result["risks"]:
-                report += f"- {risk['description']} (Risk level: {risk['level'].upper()})\n"
-            report += "\n"
-            
-            report += "SIMPLIFIED EXPLANATION:\n"
-            report += result["simplified_text"]
+            # Create the downloadable reports
+            reports = _build_report_sections(result)
             
             # Create a stylish download card
             st.markdown('<div class="download-card">', unsafe_allow_html=True)
@@ -562,20 +726,15 @@ def main():
             dl_col1, dl_col2, dl_col3 = st.columns(3)
             
             with dl_col1:
-                st.markdown(create_download_link(report, "legal_analysis_report.txt", "Full Report"), unsafe_allow_html=True)
+                st.download_button("📥 Full Report", reports["full"], file_name="legal_analysis_report.txt", mime="text/plain")
             
             with dl_col2:
                 # Summary only download
-                summary_report = f"Document Summary - {result['file_name']}\n\n"
-                summary_report += result["summary"]
-                st.markdown(create_download_link(summary_report, "document_summary.txt", "Summary Only"), unsafe_allow_html=True)
+                st.download_button("📥 Summary Only", reports["summary"], file_name="document_summary.txt", mime="text/plain")
             
             with dl_col3:
                 # Risks only download
-                risks_report = f"Risk Assessment - {result['file_name']}\n\n"
-                for risk in result["risks"]:
-                    risks_report += f"- {risk['description']} (Risk level: {risk['level'].upper()})\n"
-                st.markdown(create_download_link(risks_report, "risk_assessment.txt", "Risks Only"), unsafe_allow_html=True)
+                st.download_button("📥 Risks Only", reports["risks"], file_name="risk_assessment.txt", mime="text/plain")
             
             st.markdown('</div>', unsafe_allow_html=True)
             